@@ -39,8 +39,12 @@ is mostly a textual massaging of a wrapper template teem/python/cffi/lliibb.py.
 import sys
 import os
 import re
-import subprocess
 import csv
+import functools
+import hashlib
+import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import cffi
 
@@ -88,13 +92,36 @@ _tldeps = {
               'pull', 'coil', 'push', 'mite'],
     # fmt: on
 }
+# all the Teem libraries in dependency order, and the index of each in that order
+_tlall = tuple(_tldeps.keys())
+_tlidx = {lib: idx for idx, lib in enumerate(_tlall)}
+
+# Matches C comments (both /* */ and //), or else string and character literals (group 1),
+# so that comment delimiters inside literals are not mistaken for comments. Like
+# "unu uncmt" (which this replaces), every character of a comment other than newline becomes
+# a space (in C a comment is whitespace, so the tokens around it must stay separate), the
+# newlines are kept (so line numbers are unchanged), and literals are kept as is.
+_CMT_RE = re.compile(
+    r'/\*.*?\*/|//[^\n]*|("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')', re.DOTALL
+)
+# matches any character other than newline, for blanking out comments
+_NOT_NL_RE = re.compile(r'[^\n]')
+
+
+def uncomment(text: str) -> str:
+    """
+    Returns given C source text with all comments blanked out: each comment character other
+    than newline is replaced by a space, as "unu uncmt" does, but without having to run unu
+    as a subprocess.
+    """
+    return _CMT_RE.sub(lambda match: match.group(1) or _NOT_NL_RE.sub(' ', match.group(0)), text)
 
 
 def tlib_all() -> list[str]:
     """
     Returns list of all Teem libraries in dependency order
     """
-    return list(_tldeps.keys())
+    return list(_tlall)
 
 
 def tlib_depends(lib: str) -> list[str]:
@@ -105,19 +132,17 @@ def tlib_depends(lib: str) -> list[str]:
         deps = _tldeps[lib]
     except Exception as exc:
         raise RuntimeError(f'{lib} is not a known Teem library') from exc
-    # iteratively find all dependencies and dependencies of dependencies, etc
-    oldd = set()  # all previously dependencies known
-    newd = set([lib]) | set(deps)  # newly discovered dependencies
-    while oldd != newd:
-        # while new dependencies were just discovered
-        tmpd = set()
-        for nlb in newd:
-            tmpd = tmpd | set([lib]) | set(_tldeps[nlb])
-        oldd = newd
-        newd = tmpd
-    tla = tlib_all()  # linear array of all libs in dependency order
+    # single depth-first traversal to find all dependencies and dependencies of dependencies,
+    # etc, visiting each library only once
+    found = set([lib])  # all dependencies found so far
+    todo = list(deps)  # stack of libraries to visit
+    while todo:
+        nlb = todo.pop()
+        if not nlb in found:
+            found.add(nlb)
+            todo += _tldeps[nlb]
     # return dependencies sorted in dependency order
-    ret = sorted(list(newd), key=tla.index)
+    ret = sorted(found, key=_tlidx.__getitem__)
     return ret
 
 
@@ -169,12 +194,15 @@ def check_path_thdr(path_thdr: str):
     Main purpose is to do sanity check on Teem include path path_thdr and the header files
     found there.
     """
-    itpath = path_thdr + '/teem'
+    itpath = os.path.join(path_thdr, 'teem')
     if not os.path.isdir(itpath):
         raise Exception(f'Need {itpath} to be directory')
-    all_libs = tlib_all()
+    all_libs = _tlall
     all_hdrs = sum([tlib_headers(L) for L in all_libs], [])
-    missing_hdrs = list(filter(lambda F: not os.path.isfile(f'{itpath}/{F}'), all_hdrs))
+    # one directory scan, rather than an os.path.isfile() for each header
+    with os.scandir(itpath) as entries:
+        have_hdrs = {E.name for E in entries if E.is_file()}
+    missing_hdrs = [F for F in all_hdrs if not F in have_hdrs]
     if missing_hdrs:
         raise Exception(
             f'Missing header(s) {" ".join(missing_hdrs)} in {itpath} '
@@ -194,8 +222,8 @@ def check_path_tinst(path: str):
         path = os.path.expanduser(path)
         if not os.path.isdir(path):
             raise Exception(f'Given path {path} is not a directory')
-    path_thdr = os.path.abspath(path + '/include')
-    path_tlib = os.path.abspath(path + '/lib')
+    path_thdr = os.path.abspath(os.path.join(path, 'include'))
+    path_tlib = os.path.abspath(os.path.join(path, 'lib'))
     if not os.path.isdir(path_thdr) or not os.path.isdir(path_tlib):
         raise Exception(
             f'Need both {path_thdr} and {path_tlib} to be subdirs of teem install dir {path}'
@@ -205,6 +233,23 @@ def check_path_tinst(path: str):
     return (path_thdr, path_tlib)
 
 
+@functools.lru_cache(maxsize=None)
+def _cdef_text(path: str, mtime_ns: int) -> str:
+    """
+    Returns contents of cdef header at path. The modification time mtime_ns is not used
+    here, but it is part of the key for the lru_cache, so that re-reading a header is
+    skipped only while it is unchanged.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+# Version of the output of CdefHdr.scan() (and uncomment()), part of the key of the on-disk
+# cache of scan results; increment this with any change to how headers are scanned, so that
+# results cached by an earlier version are not re-used
+_SCAN_CACHE_VERSION = 1
+
+
 class CdefHdr:
     """
     Given a header file, figures out which lines should be passed to ffi.cdef(), by first
@@ -215,31 +260,13 @@ class CdefHdr:
 
     def __init__(self, filename: str, defined: dict[str, str], verb: int = 0):
         """
-        Opens given file and sends it through "unu uncmt", and prepares to parse result
+        Checks given file, and prepares to parse it
         """
         if not os.path.isfile(filename):
             raise Exception(f'header filename {filename} not a file')
         self.filename = filename
-        try:
-            subprocess.run(['unu', '--help'], check=True, stdout=subprocess.PIPE)
-        except Exception as exc:
-            raise RuntimeError(
-                'Seems that "unu" is not in $PATH; have you installed Teem?'
-            ) from exc
-        try:
-            subprocess.run(['unu', 'uncmt'], check=True, stdout=subprocess.PIPE)
-        except Exception as exc:
-            raise RuntimeError(
-                'The "unu" in $PATH is not new enough to have "unu uncmt"; try updating Teem'
-            ) from exc
-        uncmt = subprocess.run(
-            # run "unu uncmt" to completely excise comments
-            ['unu', 'uncmt', filename, '-'],
-            check=True,
-            stdout=subprocess.PIPE,
-        )
-        # add empty line to make line numbering effectively 1-based
-        self.ilines = [''] + uncmt.stdout.decode('utf-8').splitlines()
+        # lines of input file, with comments excised; read by scan() (unless it hits the cache)
+        self.ilines = []
         # will accumulate processed lines
         self.olines = []
         # saving other initialization args
@@ -251,8 +278,69 @@ class CdefHdr:
 
     def scan(self):
         """
-        Do our best to scan input self.ilines to make output self.olines
+        Do our best to scan input file to make output self.olines. If environment variable
+        EXULT_SCAN_CACHE is set (non-empty), the results are cached on disk (in
+        ~/.cache/exult/scan_cdef) and re-used as long as the header file (its size and
+        modification time) and the initial #defines are unchanged.
         """
+        if not os.environ.get('EXULT_SCAN_CACHE'):
+            return self._scan()
+        stt = os.stat(self.filename)
+        ckey = (
+            _SCAN_CACHE_VERSION,
+            stt.st_size,
+            stt.st_mtime_ns,
+            sorted(self.defined.items()),
+        )
+        apath = os.path.abspath(self.filename)
+        cpath = os.path.join(
+            os.path.expanduser('~/.cache/exult/scan_cdef'),
+            hashlib.sha1(apath.encode('utf-8')).hexdigest() + '.pkl',
+        )
+        try:
+            with open(cpath, 'rb') as file:
+                (okey, olines, defined) = pickle.load(file)
+        except Exception:
+            # no cache, or an unreadable or malformed one; whatever the failure, it is a miss
+            okey = None
+        if okey == ckey:
+            if self.verb:
+                print(f'CdefHdr.scan: re-using cached scan of {apath} from {cpath}')
+            # restore both the output lines and the side-effect of scanning on self.defined
+            self.olines = olines
+            self.defined.update(defined)
+            return self.olines
+        self._scan()
+        # write to a temporary file and then (atomically) rename it, so that a concurrent build
+        # never reads a half-written cache file. The cache is only an optimization, so failing
+        # to write it is not an error (but the temporary file is not left behind)
+        tpath = None
+        try:
+            os.makedirs(os.path.dirname(cpath), exist_ok=True)
+            (tfd, tpath) = tempfile.mkstemp(dir=os.path.dirname(cpath), suffix='.tmp')
+            with os.fdopen(tfd, 'wb') as file:
+                pickle.dump((ckey, self.olines, self.defined), file)
+            os.replace(tpath, cpath)
+        except (OSError, pickle.PicklingError) as exc:
+            if tpath is not None and os.path.exists(tpath):
+                os.unlink(tpath)
+            if self.verb:
+                print(f'CdefHdr.scan: could not cache scan of {apath} in {cpath}: {exc}')
+            return self.olines
+        if self.verb:
+            print(f'CdefHdr.scan: cached scan of {apath} in {cpath}')
+        return self.olines
+
+    def _scan(self):
+        """
+        The real work of scan(): excise comments from input file to make self.ilines, and then
+        process those to make self.olines
+        """
+        with open(self.filename, 'r', encoding='utf-8') as file:
+            # completely excise comments
+            text = uncomment(file.read())
+        # add empty line to make line numbering effectively 1-based
+        self.ilines = [''] + text.splitlines()
         for lnum, linen in enumerate(self.ilines):
             line = linen.strip()  # strip left and right whitespace
             if not line:
@@ -363,11 +451,38 @@ class Tffi:
     (2) tffi.cdef() # do the cdef declarations
     (3) tffi.set_source() # set up and make call to ffi.set_source()
     (4) tffi.compile(): # run the compilation
+    or, instead of (4), tffi.emit_c_code(...) to only write out the C source of the extension
+    module, which can be compiled later (e.g. by setuptools) without needing CFFI's C parser.
     self.step remembers the step number just done, so that these calls are made in the
     proper sequence.  Why the external interface is broken into separate steps at all
-    is unclear, but it probably helps with understanding the context of errors
+    is unclear, but it probably helps with understanding the context of errors.
+    Attributes are declared with __slots__, so new ones cannot be added to a Tffi.
     """
 
+    __slots__ = (
+        'verb',
+        'path_tsrc',
+        'path_cdef',
+        'path_biffdata',
+        'path_thdr',
+        'path_tlib',
+        'path_tinst',
+        'path_nhdr',
+        'path_nlib',
+        'libs',
+        'path_libs',
+        'dfnd',
+        'eca',
+        'ela',
+        'source_args',
+        'lib_out',
+        'isteem',
+        'name',
+        'top_tlib',
+        'ffi',
+        'step',
+    )
+
     def __init__(self, path_tsrc: str, path_tinst: str, top_tlib: str, verb: int = 0):
         """
         Creates a Tffi from the given arguments:
@@ -391,12 +506,12 @@ class Tffi:
                     f'Need path {path_tsrc} into Teem source checkout to be a directory'
                 )
         self.path_tsrc = path_tsrc
-        self.path_cdef = path_tsrc + '/python/cffi/cdef'
+        self.path_cdef = os.path.join(path_tsrc, 'python', 'cffi', 'cdef')
         if not os.path.isdir(self.path_cdef):
             raise Exception(
                 f'Missing directory with per-Teem-library cdef headers {self.path_cdef}'
             )
-        self.path_biffdata = path_tsrc + '/python/cffi/biffdata'
+        self.path_biffdata = os.path.join(path_tsrc, 'python', 'cffi', 'biffdata')
         if not os.path.isdir(self.path_biffdata):
             raise Exception(
                 f'Missing directory with per-Teem-library biff .csv files {self.path_biffdata}'
@@ -457,7 +572,7 @@ class Tffi:
             raise Exception('Can use .desc() only when making non-Teem module ')
         if 'lliibb' == name:
             raise Exception("Sorry, can't risk over-writing template wrapper lliibb.py")
-        if 'teem' == name or name in tlib_all():
+        if 'teem' == name or name in _tlidx:
             raise Exception('Need non-Teem name for non-Teem library')
         if name.startswith('_'):
             raise Exception(
@@ -481,27 +596,36 @@ class Tffi:
 
     def cdef(self):
         """
-        Make calls to ffi.cdef() to declare to CFFI what should be in the extension module
+        Make the call to ffi.cdef() to declare to CFFI what should be in the extension module
         (the members of the module's .lib)
         """
         if 1 != self.step:
             raise Exception('Expected .cdef() only right after Tffi creation and optional .desc()')
         # want free() available for freeing biff messages
-        self.ffi.cdef('extern void free(void *);')
+        texts = ['extern void free(void *);']
         # read in the relevant Teem cdef/ headers
-        for lib in tlib_depends(self.top_tlib):
-            if self.verb:
-                print(f'Tffi.cdef: reading {self.path_cdef}/cdef_{lib}.h ...')
-            with open(f'{self.path_cdef}/cdef_{lib}.h', 'r', encoding='utf-8') as file:
-                self.ffi.cdef(file.read())
+        paths = [
+            os.path.join(self.path_cdef, f'cdef_{lib}.h') for lib in tlib_depends(self.top_tlib)
+        ]
+        if self.verb:
+            for path in paths:
+                print(f'Tffi.cdef: reading {path} ...')
+        # reads are done in parallel, to overlap the latency of (e.g.) a network file system;
+        # pool.map() returns results in the order of paths, so the declarations stay in order
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            texts += pool.map(lambda P: _cdef_text(P, os.stat(P).st_mtime_ns), paths)
         if not self.isteem:
-            scnr = CdefHdr(f'{self.path_nhdr}/{self.name}.h', self.dfnd, verb=self.verb)
+            scnr = CdefHdr(
+                os.path.join(self.path_nhdr, f'{self.name}.h'), self.dfnd, verb=self.verb
+            )
             lines = scnr.scan()
             if self.verb:
-                print('Tffi.cdef: calling cdef on:')
+                print(f'Tffi.cdef: from {self.name}.h, will call cdef on:')
                 for line in lines:
                     print(f'...{line}')
-            self.ffi.cdef('\n'.join(lines))
+            texts.append('\n'.join(lines))
+        # one ffi.cdef() call (rather than one per header) so its C parser is only run once
+        self.ffi.cdef('\n'.join(texts))
         self.step = 2
 
     def set_source(self):
@@ -559,6 +683,19 @@ class Tffi:
         self.step = 3
         return self.source_args
 
+    def emit_c_code(self, out_path: str) -> None:
+        """
+        Instead of .compile(), write the C source for the extension module to out_path. All the
+        work of parsing the cdef declarations is done by now, so the resulting .c file can be
+        distributed and compiled elsewhere (e.g. with setuptools, using the same arguments
+        returned by .set_source()) without using CFFI's C parser (pycparser) there.
+        """
+        if 3 != self.step:
+            raise Exception('Expected .emit_c_code() only right after .set_source()')
+        if self.verb:
+            print(f'Tffi.emit_c_code: writing C source for _{self.name} to {out_path}')
+        self.ffi.emit_c_code(out_path)
+
     def compile(self, run_int: bool):
         """Finally call ffi.compile()"""
         if 3 != self.step:
@@ -629,7 +766,9 @@ class Tffi:
         _rvt_func: *r*eturn *v*alue *t*est function: Given the string representation of the
         error return value(s) errval, of type errval_t, as it came out of the biffdata .csv
         file, return another string representation of a Python *function* (which returns a bool
-        given the returned value from the CFFI-wrapped function) to store in the _BIFF_DICT
+        given the returned value from the CFFI-wrapped function) to store in the _BIFF_DICT.
+        Less common tests are instead represented by a string literal of a boolean expression
+        of the return value rv, which the wrapper inlines into its generated code.
         """
         # most common case: return of 1 means there's a biff error
         if errval_t.endswith('int') and '1' == errval:
@@ -640,12 +779,9 @@ class Tffi:
             ret = '_math.isnan'
         else:
             evlist = errval.split('|')  # list (likely length-1) of error-indicating return values
-            ret = (
-                '(lambda rv: '  # we make (a string representing) a lambda function
-                # join, with "or", test expressions for everything in evlist
-                + ' or '.join([self._rvt_expr(errval_t, v, 'rv') for v in evlist])
-                + ')'
-            )
+            # we make (a string representing) a string literal of an expression that joins,
+            # with "or", test expressions for everything in evlist
+            ret = repr(' or '.join([self._rvt_expr(errval_t, v, 'rv') for v in evlist]))
         return ret
 
     def wrap(self, ofilename: str, nbdfn: str = '') -> None:
@@ -660,7 +796,7 @@ class Tffi:
             raise Exception('Expected .wrap() only after creation, .desc(), or .compile()')
         biffdatas = []  # a list of rows from .csv files
         for lib in tlib_depends(self.top_tlib):
-            path_bdata = self.path_biffdata + f'/{lib}.csv'
+            path_bdata = os.path.join(self.path_biffdata, f'{lib}.csv')
             if not os.path.isfile(path_bdata):
                 if self.verb:
                     print(f'Tffi.wrap: library {lib} has no biffdata .csv file, moving on')
@@ -681,7 +817,7 @@ class Tffi:
                 bdrows.pop(0)
 
         # lliibb.py is the template for python wrapper around extension module _{self.name}
-        path_lliibb = self.path_tsrc + '/python/cffi/lliibb.py'
+        path_lliibb = os.path.join(self.path_tsrc, 'python', 'cffi', 'lliibb.py')
         if not os.path.isfile(path_lliibb):
             raise Exception("Didn't see wrapper template at {path_lliibb}")
         with open(path_lliibb, 'r', encoding='utf-8') as file:
@@ -26,10 +26,24 @@ functionality.  See teem/python/cffi/README.md.
 teem/python/cffi/exult.py was likely used to both compile the _lliibb extension module (the
 shared library), and to generate this wrapper, which is the result of simple text
 transformations of the template wrapper in teem/python/cffi/LLIIBB.py
+
+Looking up something in this module (like lliibb.nrrdLoad) is a normal attribute lookup, but
+inside a hot loop it is still a cost paid on every iteration. In that case, look it up once
+before the loop (e.g. nrrdLoad = lliibb.nrrdLoad) and call the local name inside the loop.
+If the biff error checking itself is too costly (e.g. for a function called per-voxel), the
+un-wrapped C function is still available as lliibb.lib.nrrdLoad; calling it skips the Python
+wrapper entirely, but then errors have to be detected by checking the return value, and the
+biff error message retrieved with biffGetDone().
 """
 
+import operator as _operator
+import re as _re
 import math as _math   # # likely used in _BIFF_DICT, below, for testing function return values
 import sys as _sys
+import types as _types
+import functools as _functools
+import itertools as _itertools
+import threading as _threading
 import argparse as _argparse
 
 # halt if python2; thanks to https://stackoverflow.com/a/65407535/1465384
@@ -43,23 +57,111 @@ def string(bstr):
     return _lliibb.ffi.string(bstr).decode('ascii')
 
 
+def _int_arg(val) -> bool:
+    """For the Tenum methods that take an integer enum value val, when it is not exactly an int:
+    True if val can be looked up as an int (e.g. an IntEnum), or False if val is a bool,
+    which (as in Tenum.valid()) is never a valid value, even though True == 1. Anything else
+    is an error (raised as a TypeError, which unlike an assert is not skipped under -O)"""
+    if isinstance(val, bool):
+        return False
+    if isinstance(val, int):
+        return True
+    raise TypeError(f'Need an int argument (not {type(val)})')
+
+
 class Tenum:
     """Helper/wrapper around (pointers to) airEnums (part of Teem's "air" library).
     This provides convenient ways to convert between integer enum values and real Python
     strings. The C airEnum underlying the Python Tenum foo is still available as foo().
+    Attributes are declared with __slots__, so new ones cannot be added to a Tenum.
     """
 
+    __slots__ = (
+        'aenm',
+        'name',
+        '_name',
+        '_vals',
+        '_val_set',
+        '_ffi_string',
+        '_c_str',
+        '_c_val',
+        '_c_desc',
+        '_unknown_val',
+        '_str_cache',
+        '_val_cache',
+        '_str_unknown',
+        '_val_parse',
+        '_strs',
+        '_desc_cache',
+        '_desc_unknown',
+    )
+
     def __init__(self, aenm, _name):
         """Constructor takes a Teem airEnum pointer (const airEnum *const)."""
-        if not str(aenm).startswith("<cdata 'airEnum *' "):
+        # (asking ffi.typeof is cheaper than formatting str(aenm) to see its type)
+        if not (
+            isinstance(aenm, _lliibb.ffi.CData)
+            and _lliibb.ffi.typeof(aenm) is _AIRENUM_PTR
+        ):
             raise TypeError(f'passed argument {aenm} does not seem to be an airEnum pointer')
         self.aenm = aenm
-        self.name = string(self.aenm.name)
-        self._name = _name  # the variable name for the airEnum in libteem
-        # following definition of airEnum struct in air.h
-        self.vals = list(range(1, self.aenm.M + 1))
+        # bind the CFFI objects used by the methods below, to skip the repeated attribute
+        # lookups in (e.g.) _lliibb.lib.airEnumStr
+        self._ffi_string = _lliibb.ffi.string
+        self._c_str = _lliibb.lib.airEnumStr
+        self._c_val = _lliibb.lib.airEnumVal
+        self._c_desc = _lliibb.lib.airEnumDesc
+        # names are interned, so that comparing them elsewhere is by identity
+        self.name = _sys.intern(string(self.aenm.name))
+        self._name = _sys.intern(_name)  # the variable name for the airEnum in libteem
+        # following definition of airEnum struct in air.h: the valid values are either
+        # val[1] through val[M] (copied out of C with one ffi.unpack, starting from val+1 so
+        # that no slice is needed), or 1 through M. These are stored in a (read-only) tuple
         if self.aenm.val:
-            self.vals = [self.aenm.val[i] for i in self.vals]
+            self._vals = tuple(_lliibb.ffi.unpack(self.aenm.val + 1, self.aenm.M))
+        else:
+            self._vals = tuple(range(1, self.aenm.M + 1))
+        # airEnumValCheck(aenm, v) is zero (v is valid) exactly when v is one of these values,
+        # so valid(v) can be answered with a set membership test, without calling into C
+        self._val_set = frozenset(self._vals)
+        # the value representing unknown never changes, so learn it only once
+        self._unknown_val = _lliibb.lib.airEnumUnknown(self.aenm)
+        # caches of conversions between values and strings; built by _populate() when needed
+        self._str_cache = None
+        self._val_cache = None
+        self._str_unknown = None
+        self._val_parse = None
+        self._strs = None
+        # descriptions are less commonly needed; cached on first use by desc()
+        self._desc_cache = {}
+        self._desc_unknown = None
+
+    def _populate(self):
+        """Cache conversions between the valid values and their (canonical) strings, to avoid
+        calls into the C library for those. Both are read-only views of the dicts. Any invalid
+        value is converted to the same string for unknown (what airEnumStr() does). Strings
+        that are not canonical (which airEnumVal() might parse with case-insensitivity or
+        synonyms) go through the C library, but the most recent results of that are cached
+        too. This is done on first use rather than in the constructor, since there are many
+        airEnums in Teem, but any one program likely uses only a few. The strings are
+        interned, so that callers comparing them with other interned strings (like literals)
+        can short-circuit on identity."""
+        str_cache = {
+            v: _sys.intern(self._ffi_string(self._c_str(self.aenm, v)).decode('utf8'))
+            for v in self._vals
+        }
+        val_cache = {}
+        for sss in str_cache.values():
+            val = self._c_val(self.aenm, sss.encode('ascii'))
+            if val != self._unknown_val:
+                val_cache[sss] = val
+        self._str_cache = _types.MappingProxyType(str_cache)
+        self._val_cache = _types.MappingProxyType(val_cache)
+        self._str_unknown = _sys.intern(self._ffi_string(self.aenm.str[0]).decode('utf8'))
+        self._strs = tuple(str_cache.values())
+        self._val_parse = _functools.lru_cache(maxsize=256)(
+            lambda sss: self._c_val(self.aenm, sss.encode('ascii'))
+        )
 
     def __call__(self):
         """Returns (a pointer to) the underlying airEnum."""
@@ -67,62 +169,129 @@ class Tenum:
 
     def __iter__(self):
         """Provides a way to iterate through the valid values of the enum"""
-        return iter(self.vals)
+        return iter(self._vals)
 
     def vals(self):
-        """Provides list of valid values"""
-        return self._vals.copy()
+        """Provides (read-only) tuple of valid values"""
+        return self._vals
 
     def valid(self, ios) -> bool:  # ios = int or string
         """Answers whether given int is a valid value of enum, or whether given string
         is a valid string in enum, depending on incoming type.
-        (wraps airEnumValCheck() and airEnumVal())"""
+        (mirrors airEnumValCheck(), and wraps airEnumVal()). A bool is not a valid value
+        (even though bool is a subclass of int), so valid(True) is False."""
+        # exact type checks for the common case, cheaper than isinstance()
+        tios = type(ios)
+        if tios is int:
+            return ios in self._val_set
+        if tios is str:
+            return self.valid_str(ios)
+        if tios is bool:
+            return False
+        # else maybe a subclass
         if isinstance(ios, int):
-            return not _lliibb.lib.airEnumValCheck(self.aenm, ios)
+            return ios in self._val_set
         if isinstance(ios, str):
-            return self.unknown() != self.val(ios)
+            return self.valid_str(ios)
         # else
         raise TypeError(f'Need an int or str argument (not {type(ios)})')
 
+    def valid_int(self, val: int) -> bool:
+        """valid() for callers that know they have an int: whether val is a valid value of
+        enum, without the type dispatch (mirrors airEnumValCheck()). Like valid(), a bool
+        is not a valid value."""
+        return val in self._val_set and type(val) is not bool
+
+    def valid_str(self, sss: str) -> bool:
+        """valid() for callers that know they have a string: whether sss is a valid string
+        in enum, without the type dispatch (wraps airEnumVal())"""
+        return self._unknown_val != self.val(sss)
+
     def str(self, val: int, picky=False, excls=ValueError) -> str:
         """Converts from integer enum value val to string identifier.
         If picky, then failure to parse string generates an exception,
         of class excls (defaults to ValueError) (wraps airEnumStr())"""
-        assert isinstance(val, int), f'Need an int argument (not {type(val)})'
-        if picky and not self.valid(val):
+        if self._str_cache is None:
+            self._populate()
+        # the exact type test is cheap; only other types go through _int_arg()
+        if (type(val) is int or _int_arg(val)) and (ret := self._str_cache.get(val)) is not None:
+            return ret
+        # else val is not valid
+        if picky:
             raise excls(f'{val} not a valid {self._name} ("{self.name}") enum value')
         # else
-        return _lliibb.ffi.string(_lliibb.lib.airEnumStr(self.aenm, val)).decode('utf8')
+        return self._str_unknown
 
     def strs(self):
-        """Provides a list of strings for the valid values"""
-        return [self.str(v) for v in self.vals()]
+        """Provides (read-only) tuple of strings for the valid values"""
+        if self._strs is None:
+            self._populate()
+        return self._strs
 
     def desc(self, val: int) -> str:
         """Converts from integer value val to description string
         (wraps airEnumDesc())"""
-        assert isinstance(val, int), f'Need an int argument (not {type(val)})'
-        return string(_lliibb.lib.airEnumDesc(self.aenm, val))
-
-    def val(self, sss: str, picky=False) -> int:
-        """Converts from string sss to integer enum value
-        (wraps airEnumVal())"""
-        assert isinstance(sss, str), f'Need an string argument (not {type(sss)})'
-        ret = _lliibb.lib.airEnumVal(self.aenm, sss.encode('ascii'))
-        if picky and ret == self.unknown():
-            raise ValueError(f'"{sss}" not parsable as {self._name} ("{self.name}") enum value')
+        if self._desc_unknown is None:
+            # first use: learn the descriptions of all the values in one pass
+            for vv in self._vals:
+                self._desc_cache[vv] = string(self._c_desc(self.aenm, vv))
+            # airEnumDesc() gives the same description of unknown for every invalid value,
+            # so that is learned once too, instead of caching it per invalid value
+            self._desc_unknown = string(self._c_desc(self.aenm, self._unknown_val))
+        # the exact type test is cheap; only other types go through _int_arg()
+        if (type(val) is int or _int_arg(val)) and (ret := self._desc_cache.get(val)) is not None:
+            return ret
+        # else val is not valid
+        return self._desc_unknown
+
+    def val(self, sss: str, picky=False, excls=ValueError) -> int:
+        """Converts from string sss to integer enum value.
+        If picky, then failure to parse string generates an exception,
+        of class excls (defaults to ValueError). Only strings that are not already
+        known are encoded to bytes, and those only once (wraps airEnumVal())"""
+        # the exact type test is cheap; only other types go through isinstance()
+        if type(sss) is not str and not isinstance(sss, str):
+            raise TypeError(f'Need a string argument (not {type(sss)})')
+        if self._val_cache is None:
+            self._populate()
+        if (ret := self._val_cache.get(sss)) is not None:
+            return ret
+        # else not a canonical string; see what airEnumVal() makes of it
+        ret = self._val_parse(sss)
+        if picky and ret == self._unknown_val:
+            raise excls(f'"{sss}" not parsable as {self._name} ("{self.name}") enum value')
         # else
         return ret
 
+    def str_all(self, vals) -> list:
+        """Converts every integer value in iterable vals (which can be a numpy array) to its
+        string identifier, like str() (non-picky) but in one pass over vals, with the
+        conversions done at C level by map() and the cached val-to-string dict"""
+        if self._str_cache is None:
+            self._populate()
+        return list(map(self._str_cache.get, vals, _itertools.repeat(self._str_unknown)))
+
+    def val_all(self, ssss) -> list:
+        """Converts every string in iterable ssss to its integer enum value, like val()
+        (non-picky) but in one pass over ssss"""
+        if self._val_cache is None:
+            self._populate()
+        get = self._val_cache.get
+        parse = self._val_parse
+        return [ret if (ret := get(sss)) is not None else parse(sss) for sss in ssss]
+
     def unknown(self) -> int:
         """Returns value representing unknown
-        (wraps airEnumUnknown())"""
-        return _lliibb.lib.airEnumUnknown(self.aenm)
+        (wraps airEnumUnknown(), as called once by the constructor)"""
+        return self._unknown_val
 
 
 class TenumVal:
     """Represents one value in a Tenum, in a way that can be both an int and a string,
-    and that remembers which Tenum it is part of"""
+    and that remembers which Tenum it is part of. Like Tenum, attributes are declared with
+    __slots__ (there may be many TenumVals, so they should be small)."""
+
+    __slots__ = ('tenum', 'val')
 
     def __init__(self, tenum, ios):
         """Create enum value from Tenum and either int or string value"""
@@ -147,17 +316,31 @@ class TenumVal:
         return f'{self.tenum.str(self.val)}:({self.tenum.name} enum)'
 
     def __eq__(self, other):
-        """Test equality between two things"""
+        """Test equality with another TenumVal, or with an int or string of the same enum.
+        Anything else (including a bool) is not comparable, and is left to Python (so the
+        result is False), rather than raising an exception, since sets and dicts may compare
+        a TenumVal with anything of the same hash."""
         if isinstance(other, TenumVal):
-            if self.tenum != other.tenum:
-                return False
-            # else other same kind of tenum
-            return self.val == other.val
+            # Tenums wrap distinct airEnums, so identity is the right test
+            return self.tenum is other.tenum and self.val == other.val
         # else other not a tenum
+        if isinstance(other, str):
+            # one (cached) string lookup does both the validity check and the conversion
+            oval = self.tenum.val(other)
+            if oval == self.tenum.unknown():
+                raise ValueError(f'Given {other=} not member of enum {self.tenum.name}')
+            return self.val == oval
+        if not isinstance(other, int) or isinstance(other, bool):
+            return NotImplemented
         if not self.tenum.valid(other):
             raise ValueError(f'Given {other=} not member of enum {self.tenum.name}')
-        oval = other if isinstance(other, int) else self.tenum.val(other)
-        return self.val == oval
+        return self.val == other
+
+    def __hash__(self):
+        """Hash of own value; consistent with equality to ints and other TenumVals. Equality
+        to strings is excluded from this: a TenumVal can equal a string with a different hash,
+        so looking up a TenumVal in a set or dict of strings (or vice versa) does not find it"""
+        return hash(self.val)
 
 
 class TenumValParseAction(_argparse.Action):
@@ -169,8 +352,13 @@ class TenumValParseAction(_argparse.Action):
         self.tenum = tenum
 
     def __call__(self, _parser, namespace, string, _option_string=None):
-        # parse value from string
-        val = self.tenum.val(string, True, _argparse.ArgumentTypeError)
+        # parse value from string (with the Tenum's caches, so repeated strings are cheap)
+        try:
+            val = self.tenum.val(string, True, _argparse.ArgumentTypeError)
+        except _argparse.ArgumentTypeError as exc:
+            # argparse only reports an ArgumentTypeError as a usage error when it comes from a
+            # type= converter; from an Action it has to be an ArgumentError instead
+            raise _argparse.ArgumentError(self, str(exc)) from exc
         tval = TenumVal(self.tenum, val)
         # Set the parsed result in the namespace
         setattr(namespace, self.dest, tval)
@@ -186,9 +374,61 @@ def _equals_null(val):   # likely used in _BIFF_DICT, below
     return val == _lliibb.ffi.NULL
 
 
-_BIFF_DICT = {  # contents here are filled in by teem/python/cffi/exult.py Tffi.wrap()
+# _BIFF_DICT is only read (when biff wrappers are created), so it is a read-only mapping
+_BIFF_DICT = _types.MappingProxyType({  # contents here are filled in by exult.py Tffi.wrap()
     'key': 'val',  # INSERT_BIFFDICT here
-}
+})
+
+
+def _raise_biff(rv, func_name: str, bkey: bytes, fnln: str):
+    """
+    The error path of the wrappers made by _biffer: retrieves the biff error message
+    (with key bkey) and raises it as a Python exception. Kept out of the wrappers themselves,
+    so that they do as little as possible when there is no error.
+    """
+    err = _lliibb.lib.biffGetDone(bkey)
+    # strip trailing whitespace from the bytes, so there is only one str to make. Messages can
+    # include non-ASCII bytes (e.g. from filenames); 'replace' ensures that decoding cannot
+    # itself fail and hide the error being reported
+    estr = _lliibb.ffi.string(err).rstrip().decode('ascii', 'replace')
+    _lliibb.lib.free(err)
+    raise RuntimeError(f'return value {rv} from C function "{func_name}" ({fnln}):\n{estr}')
+
+
+# matches references, in tests from _BIFF_DICT, to things in the library
+_LIB_CONST_RE = _re.compile(r'\b_lliibb\.lib\.(\w+)\b')
+
+
+def _lib_const_literal(match) -> str:
+    """For _LIB_CONST_RE.sub: the value of an integer library constant as a literal, or else
+    the original reference (left to be looked up in the namespace of the generated wrapper)"""
+    try:
+        return str(_lliibb.ffi.integer_const(match.group(1)))
+    except _lliibb.ffi.error:
+        return match.group(0)
+
+
+@_functools.lru_cache(maxsize=None)
+def _wrapper_factory(params: str, test: str):
+    """
+    Compiles (with exec) and returns the factory for _biffer wrappers that take parameters
+    params and raise a biff error if test. Many biff-using functions share the same params
+    and test, so this is cached to compile each distinct wrapper source only once.
+    """
+    # the namespace has _lliibb for tests (from _BIFF_DICT) that refer to things in the library
+    # (and __name__, so that the wrappers get this as their __module__)
+    nspc = {'_lliibb': _lliibb, '__name__': __name__}
+    exec(  # pylint: disable=exec-used
+        'def factory(func, rvtf, null, raise_biff, func_name, bkey, fnln):\n'
+        f'    def wrapper({params}):\n'
+        f'        rv = func({params})\n'
+        f'        if {test}:\n'
+        '            raise_biff(rv, func_name, bkey, fnln)\n'
+        '        return rv\n'
+        '    return wrapper\n',
+        nspc,
+    )
+    return nspc['factory']
 
 
 def _biffer(func, func_name: str, blob):
@@ -196,39 +436,63 @@ def _biffer(func, func_name: str, blob):
     generates function wrappers that turn C biff errors into Python exceptions
     """
     (
-        rvtf,  # C-function return value test function
+        rvtf,  # C-function return value test function, or test expression of return value rv
         mubi,  # Maybe useBiff index (1-based) into function arguments
         bkey,  # bytes for biff key to retrieve biff error
         fnln,  # filename and line number of C function
     ) = blob
 
-    def wrapper(*args):
-        """
-        function wrapper that turns C biff errors into Python exceptions
-        """
-        ret_val = func(*args)
-        # we have to get biff error if rvtf(ret_val) indicates error, and,
-        # either: this function definitely uses biff (0 == mubi)
-        #     or: (this function maybe uses biff and) "useBiff" args[mubi-1] is True
-        if rvtf(ret_val) and (0 == mubi or args[mubi - 1]):
-            err = _lliibb.lib.biffGetDone(bkey)
-            estr = string(err).rstrip()
-            _lliibb.lib.free(err)
-            raise RuntimeError(
-                f'return value {ret_val} from C function "{func_name}" ({fnln}):\n{estr}'
-            )
-        return ret_val
-
+    # We have to get biff error if the return value indicates error, and,
+    # either: this function definitely uses biff (0 == mubi)
+    #     or: (this function maybe uses biff and) "useBiff" argument mubi-1 is True
+    # The wrapper is generated (with exec) from source specialized to this function:
+    # - For the most common return value tests (_equals_one, _equals_null, _math.isnan), and
+    #   for tests given as expressions, the test is done inline, rather than by calling rvtf.
+    # - The wrapper takes exactly the named arguments of the C function (named a0, a1, ...),
+    #   plus *args only if the C function is variadic, to avoid packing and unpacking an
+    #   *args tuple, and the useBiff argument is referred to directly by name.
+    if rvtf is _equals_one:
+        test = 'rv == 1'
+    elif rvtf is _equals_null:
+        test = 'rv == null'
+    elif rvtf is _math.isnan:
+        # NaN is the only value not equal to itself
+        test = 'rv != rv'
+    elif isinstance(rvtf, str):
+        # integer constants from the library (like _lliibb.lib.hooverErrInit) become literals
+        test = '(' + _LIB_CONST_RE.sub(_lib_const_literal, rvtf) + ')'
+    else:
+        test = 'rvtf(rv)'
+    ftype = _lliibb.ffi.typeof(func)
+    params = ', '.join([f'a{idx}' for idx in range(len(ftype.args))] + ['*args'] * ftype.ellipsis)
+    if mubi:
+        # the useBiff argument is one of the named (not variadic) arguments
+        test += f' and a{mubi - 1}'
+    # The wrapper is made by a factory, so that func, NULL, etc. are closure variables
+    # of the wrapper (rather than globals of the exec namespace, looked up by name)
+    factory = _wrapper_factory(params, test)
+    wrapper = factory(func, rvtf, _lliibb.ffi.NULL, _raise_biff, func_name, bkey, fnln)
+    # so that repr() and errors (e.g. from calling with the wrong number of arguments) name the
+    # C function, rather than the factory's inner function
     wrapper.__name__ = func_name
-    wrapper.__doc__ = f"""
+    wrapper.__qualname__ = func_name
+    # like Python's own docstrings, these are skipped when running with -OO
+    if _sys.flags.optimize < 2:
+        wrapper.__doc__ = f"""
 error-checking wrapper around C function "{func_name}" ({fnln}):
 {func.__doc__}
 """
     return wrapper
 
 
+# The ffi.typeof(sym).kind of things in _lliibb.lib that _lliibb_Module exports as is: functions
+# (that don't use biff), and the ridiculous variety of global arrays, pointers, structs, and
+# unions in Teem. Scalar globals and constants are not cdata, so ffi.typeof() rejects them.
+_EXPORT_KINDS = frozenset(('function', 'array', 'pointer', 'struct', 'union'))
+
+
 # NOTE: this is copy-pasta from GLK's SciVis class code, and the python wrappers there
-class _lliibb_Module:
+class _lliibb_Module(_types.ModuleType):
     """An object that exists just to "become" the imported module, an old hack[1,2]
     that is still needed because even though there is now module-level __getattr__[3],
     module-level __setattr__ has been sadly rejected[4,5]. Using __setattr__ here
@@ -243,6 +507,9 @@ class _lliibb_Module:
     [3] https://peps.python.org/pep-0562/
     [4] https://discuss.python.org/t/extend-pep-562-with-setattr-for-modules/25506
     [5] https://discuss.python.org/t/pep-726-module-setattr-and-delattr/32640
+    Subclassing types.ModuleType keeps this looking like a module, and each alias becomes
+    a property on the class, so reading an aliased variable is a single descriptor call,
+    with no trip through __getattr__.
     """
 
     # _done being False indicates to __setattr__ that __init__ is in progress
@@ -250,9 +517,10 @@ class _lliibb_Module:
 
     def __init__(self):
         """Set up all the extension module wrapping"""
+        super().__init__(__name__)
         # we init ourself with the globals() to best emulate being a module
-        for kk, vv in globals().items():
-            setattr(self, kk, vv)
+        # (updating __dict__ directly, rather than going through __setattr__ for each)
+        self.__dict__.update(globals())
         # set various things that simplify using CFFI and this module
         # for slight convenience, e.g. when calling nrrdLoad with NULL (default) NrrdIoState
         self.NULL = _lliibb.ffi.NULL
@@ -265,7 +533,22 @@ class _lliibb_Module:
         # for non-const things, self._alias maps from exported name to CFFI object
         # in the underlying library
         self._alias = {}
-        # go through everything in underlying C library, and process accordingly
+        # Wrapping the biff-using functions and the airEnums is deferred until they are first
+        # accessed (by __getattr__); self._lazy maps from exported name to (maker, args),
+        # where maker(*args) creates the exported wrapper
+        self._lazy = {}
+        # serializes creating the lazy wrappers, in case of first accesses from multiple threads
+        self._lazy_lock = _threading.Lock()
+        # all of the library at once. In this, constants appear as their values, but global
+        # variables appear as CFFI-internal proxy objects (rather than their current values),
+        # which is exactly the difference needed for telling constants from global variables
+        libdict = _lliibb.lib.__dict__
+        # the things exported as is, collected here and added to __dict__ all at once at the end
+        xprts = {}
+        # go through everything in underlying C library, and process accordingly. dir() of a
+        # CFFI Lib is just its (cheap to list) symbol names, and getattr() gives the real value
+        # of each; libdict is not iterated over instead, because of those proxy objects, which
+        # are only useful for the constant vs global test below
         for sym_name in dir(_lliibb.lib):
             if 'free' == sym_name:
                 # don't export C runtime's free(), though we use it above in the biff wrapper
@@ -273,77 +556,62 @@ class _lliibb_Module:
             # sym is the symbol with name sym_name
             # (not __lib_.lib[sym_name] since '_cffi_backend.Lib' object is not subscriptable)
             sym = getattr(_lliibb.lib, sym_name)
-            # string useful for distinguishing different kinds of CFFI objects
-            strsym = str(sym)
+            # ctype of sym, for distinguishing different kinds of CFFI objects
+            if isinstance(sym, (int, float, bytes)):
+                # sym is a plain Python value (most of the library is integer constants), which
+                # ffi.typeof() would reject by raising an exception, so don't ask it
+                symtype = None
+            else:
+                symtype = _lliibb.ffi.typeof(sym)
             # The exported symbol xprt will be ...
-            if sym_name in _BIFF_DICT:
+            if (blob := _BIFF_DICT.get(sym_name)) is not None:
                 # ... or: a Python wrapper around a function known to use biff.
-                setattr(self, sym_name, _biffer(sym, sym_name, _BIFF_DICT[sym_name]))
+                self._lazy[sym_name] = (_biffer, (sym, sym_name, blob))
             # else either a function known to not use biff, or not a function,
-            elif strsym.startswith("<cdata 'airEnum *' "):
+            elif symtype is _AIRENUM_PTR:
                 # _sym is name of an airEnum, wrap it as such
-                setattr(self, sym_name, Tenum(sym, sym_name))
-            elif (
-                # Annoyingly, functions in _lliibb.lib can either look like
-                # <cdata 'int(*)(char *, ...)' 0x10af91330> or like
-                # <built-in method _lib_Foo of _cffi_backend.Lib object at 0x10b0cd210>
-                (strsym.startswith('<cdata') and '(*)(' in strsym)  # some functions
-                or strsym.startswith('<built-in method')  # other functions
-                # ridiculous list of wacky types of things in Teem
-                or strsym.startswith("<cdata 'void(*[")
-                or strsym.startswith("<cdata 'char *")
-                or strsym.startswith("<cdata 'char[")
-                or strsym.startswith("<cdata 'unsigned int *")
-                or strsym.startswith("<cdata 'unsigned int(*")
-                or strsym.startswith("<cdata 'unsigned int[")
-                or strsym.startswith("<cdata 'int[")
-                or strsym.startswith("<cdata 'int(*[")
-                or strsym.startswith("<cdata 'float(*[")
-                or strsym.startswith("<cdata 'double[")
-                or strsym.startswith("<cdata 'double(*[")
-                or strsym.startswith("<cdata 'size_t[")
-                or strsym.startswith("<cdata 'size_t(*[")
-                or strsym.startswith("<cdata 'struct ")
-                or strsym.startswith("<cdata 'airFloat &'")
-                or strsym.startswith("<cdata 'hestCB &'")
-                or strsym.startswith("<cdata 'airRandMTState *'")
-                or strsym.startswith("<cdata 'hestCB *'")
-                or strsym.startswith("<cdata 'unrrduCmd * *'")
-                or strsym.startswith("<cdata 'gageItemPack *'")
-                or strsym.startswith("<cdata 'NrrdFormat *")
-                or strsym.startswith("<cdata 'NrrdKernel *")
-                or strsym.startswith("<cdata 'coilKind &'")
-                or strsym.startswith("<cdata 'coilKind *")
-                or strsym.startswith("<cdata 'coilMethod *")
-                or strsym.startswith("<cdata 'pushEnergy *")
-                or strsym.startswith("<cdata 'pullEnergy *")
-            ):
-                # with C strings, it might be cute to instead export a real Python string, but
+                self._lazy[sym_name] = (Tenum, (sym, sym_name))
+            elif symtype is not None and symtype.kind in _EXPORT_KINDS:
+                # Functions in _lliibb.lib can either be a <cdata 'int(*)(char *, ...)'> or
+                # a <built-in method _lib_Foo of _cffi_backend.Lib object>, but either way
+                # ffi.typeof() says they are of kind 'function'.
+                # With C strings, it might be cute to instead export a real Python string, but
                 # then its value would NOT be useful as is for the underlying C library.
-                setattr(self, sym_name, sym)
+                xprts[sym_name] = sym
             else:
-                # More special cases; see if sym is an integer constant: enum or #define
-                cval = None  # value of symbol as integer const
-                try:
-                    cval = _lliibb.ffi.integer_const(sym_name)
-                except _lliibb.ffi.error:
-                    # sym_name wasn't actually an integer const; ignore the complaint.
-                    pass
-                if cval is sym:
-                    # so sym_name *is* an integer const, export that (integer) value
-                    setattr(self, sym_name, sym)
+                # More special cases; sym is a scalar that is either a constant (enum, #define,
+                # or static const) or a global variable. In libdict, constants appear as their
+                # values, but global variables appear as (CFFI-internal) proxy objects.
+                if isinstance(libdict[sym_name], (int, float)):
+                    # so sym_name *is* a constant, export that value
+                    xprts[sym_name] = sym
                 elif isinstance(sym, int) or isinstance(sym, float) or isinstance(sym, bytes):
                     # sym_name is a NON-CONST scalar, do not export, instead alias it
                     self._alias[sym_name] = sym_name
+                    # reading and writing the alias goes straight to the C library
+                    setattr(
+                        type(self),
+                        sym_name,
+                        property(
+                            _operator.attrgetter(f'lib.{sym_name}'),
+                            lambda slf, value, lname=sym_name: setattr(slf.lib, lname, value),
+                        ),
+                    )
                     # HEY in the python wrappers for GLK's SciVis, this aliasing is
                     # non-trivial e.g. `foo.Verbose` aliases _foo.lib.fooVerbose`.
                     # Here, `_alias` instead becomes a badly-named mechanism to indicate
                     # which exports might be mutable
                 else:
                     raise ValueError(
-                        f'Libary item {sym_name} is something ({strsym}) unexpected; sorry'
+                        f'Libary item {sym_name} is something ({sym}) unexpected; sorry'
                     )
         # done looping through symbols
+        self.__dict__.update(xprts)
+        # Without __all__, "from lliibb import *" would only see what is already in __dict__, and
+        # miss the lazily created wrappers. Star-importing does then create all of them.
+        self.__all__ = [
+            name for name in [*self.__dict__, *self._lazy] if not name.startswith('_')
+        ]
         # Fake out the name of this class to be name of wannabe module
         self.__class__.__name__ = __name__
         # Prevent further changes
@@ -357,12 +625,12 @@ class _lliibb_Module:
             return
         # else __init__ is done; have turned mostly read-only
         if name in self._alias:
-            # the aliases are the one thing we allow changing
-            setattr(self.lib, self._alias[name], value)
+            # the aliases are the one thing we allow changing; the property does it
+            super().__setattr__(name, value)
             # and we're done
             return
         # else try to give informative exceptions to documenting being read-only
-        if not name in self.__dict__:
+        if not name in self.__dict__ and not name in self._lazy:
             raise ValueError(
                 f'"{name}" not already in {self.__name__} wrapper module '
                 'and cannot add new elements.'
@@ -375,16 +643,26 @@ class _lliibb_Module:
         )
 
     def __getattr__(self, name):
-        """Handle requests for attributes that don't really exist;
-        currently just the aliased variables"""
-        if name in self._alias:
-            return getattr(self.lib, self._alias[name])
-        # else not an alias
-        raise KeyError(f'"{name}" not in {self.__name__} wrapper module')
+        """Handle requests for attributes that don't really exist yet: the lazily created
+        wrappers, which are created here on first access and then stored like any other
+        attribute (the aliased variables are properties, so they never get here)"""
+        if name in self._lazy:
+            with self._lazy_lock:
+                # another thread may have created it while this one waited for the lock
+                if name in self.__dict__:
+                    return self.__dict__[name]
+                maker, args = self._lazy[name]
+                xprt = self.__dict__[name] = maker(*args)
+                del self._lazy[name]
+                return xprt
+        # AttributeError (not e.g. KeyError) is what hasattr() and the import system expect
+        raise AttributeError(f'"{name}" not in {self.__name__} wrapper module')
 
     def __dir__(self):
-        """Directory of self, hacked to include the aliased variables"""
+        """Directory of self, hacked to include the aliased variables and the
+        not-yet-created wrappers"""
         lst = list(self.__dict__.keys())
+        lst.extend(self._lazy.keys())
         for name in self._alias:
             lst.append(name)
         return lst
@@ -411,6 +689,8 @@ if 'lliibb' == __name__:  # being imported
         print('*** _lliibb.cpython-platform.so.')
         print('*** Is there a build_lliibb.py script you can run to recompile it?\n')
         raise
+    # the ctype of the airEnum pointers that get wrapped as Tenums, learned once
+    _AIRENUM_PTR = _lliibb.ffi.typeof('airEnum *')
     # Finally, the object-instance-becomes-the-module fake-out workaround described in the
     # __lib_Module docstring above and the links therein.
     _sys.modules[__name__] = _lliibb_Module()